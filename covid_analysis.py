@@ -5,18 +5,68 @@
 # Import necessary libraries
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Charts are only written to files; skip interactive backend initialisation
 import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
+from matplotlib.figure import Figure
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime
+import json
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# Copy-on-Write lets the filtered frames below share memory with df until a column is assigned;
+# it is always on from pandas 3.0, where the option is deprecated
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
 # Set plot styles
 plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("Set2")
+plt.rcParams['axes.prop_cycle'] = plt.cycler(color=plt.get_cmap('Set2').colors)
 plt.rcParams['figure.figsize'] = [12, 8]
 plt.rcParams['font.size'] = 12
+# Faster zlib level for the PNG charts; files grow slightly but encode noticeably quicker
+PNG_SAVE_KWARGS = {'pil_kwargs': {'compress_level': 3}}
+
+# Variant timeline: emergence markers for the rolling-average chart and
+# the wave windows used in the variant impact analysis
+VARIANTS = {
+    'Alpha': pd.Timestamp('2020-12-01'),
+    'Delta': pd.Timestamp('2021-04-01'),
+    'Omicron': pd.Timestamp('2021-11-15')
+}
+ALPHA_START, ALPHA_END = pd.Timestamp('2020-09-01'), pd.Timestamp('2021-02-01')
+DELTA_START, DELTA_END = pd.Timestamp('2021-03-01'), pd.Timestamp('2021-08-01')
+OMICRON_START, OMICRON_END = pd.Timestamp('2021-11-01'), pd.Timestamp('2022-03-01')
+
+def render_line_chart(payload):
+    """Render one line chart payload (a date x series matrix, labels and optional markup) to its PNG file."""
+    fig = Figure(figsize=(14, 8))
+    ax = fig.add_subplot()
+    lines = ax.plot(payload['x'], payload['y'])
+    ax.set_title(payload['title'])
+    ax.set_xlabel('Date')
+    ax.set_ylabel(payload['ylabel'])
+    ax.legend(lines, payload['labels'])
+    ax.grid(True)
+    for text, x, y in payload.get('annotations', []):
+        ax.annotate(text,
+                    xy=(x, y),
+                    xytext=(10, 10),
+                    textcoords='offset points',
+                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=.2'))
+    for text, x in payload.get('vlines', []):
+        ax.axvline(x=x, color='gray', linestyle='--', alpha=0.7)
+        ax.text(x, ax.get_ylim()[1]*0.95, text, rotation=90, alpha=0.7)
+    if 'target' in payload:
+        y, label = payload['target']
+        ax.axhline(y=y, color='r', linestyle='--', label=label)
+    fig.tight_layout()
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.savefig(payload['path'], **PNG_SAVE_KWARGS)
 
 print("COVID-19 Global Data Tracker")
 print("============================")
@@ -25,9 +75,59 @@ print("============================")
 print("\n1. Data Loading & Initial Exploration")
 print("-------------------------------------")
 
+# Columns used anywhere in the analysis; the rest of the OWID file is skipped at parse time
+key_columns = ['total_cases', 'new_cases', 'total_deaths', 'new_deaths', 
+              'total_vaccinations', 'people_vaccinated', 'people_fully_vaccinated']
+correlation_columns = ['total_cases', 'total_deaths', 'new_cases', 'new_deaths', 
+                      'total_vaccinations', 'people_vaccinated', 'people_fully_vaccinated',
+                      'gdp_per_capita', 'human_development_index']
+KEY_COLS = list(dict.fromkeys(['location', 'iso_code', 'date'] + key_columns + correlation_columns +
+                              ['total_cases_per_million', 'people_fully_vaccinated_per_hundred']))
+# Parse-time dtypes: categories for the labels, nullable Int64 for the case/death counts
+# (exact beyond float32's integer range, NaN-capable, and summed without int32 overflow on
+# Windows/numpy<2) and float32 for every other metric
+COUNT_COLS = ['total_cases', 'total_deaths', 'new_cases', 'new_deaths']
+DTYPES = {col: 'Int64' if col in COUNT_COLS else 'float32' for col in KEY_COLS if col not in ('location', 'iso_code', 'date')}
+DTYPES.update({'location': 'category', 'iso_code': 'category'})
+
+OWID_CSV = Path('data/owid-covid-data.csv')
+OWID_PARQUET = Path('data/owid-covid-data.parquet')
+
+# Parquet schema metadata key holding the columns, dtypes and source CSV stat the cache was built from
+CACHE_SIGNATURE_KEY = b'covid_tracker_signature'
+
+def load_owid():
+    """Load the projected, downcast OWID dataset, reusing the Parquet cache while it matches the CSV and DTYPES."""
+    signature = {'columns': KEY_COLS, 'dtypes': DTYPES}
+    if OWID_CSV.exists():
+        # Size and exact mtime rather than "newer than": downloaders that keep the server's
+        # Last-Modified time can leave a fresh CSV looking older than the cache
+        csv_stat = OWID_CSV.stat()
+        signature.update(csv_size=csv_stat.st_size, csv_mtime_ns=csv_stat.st_mtime_ns)
+    
+    if OWID_PARQUET.exists():
+        try:
+            metadata = pq.read_schema(OWID_PARQUET).metadata or {}
+            cached = json.loads(metadata.get(CACHE_SIGNATURE_KEY, b'{}'))
+            if all(cached.get(key) == value for key, value in signature.items()):
+                return pd.read_parquet(OWID_PARQUET, engine='pyarrow', columns=KEY_COLS)
+        except (OSError, KeyError, ValueError):
+            pass  # Unreadable cache; rebuild it from the CSV
+    
+    df = pd.read_csv(OWID_CSV, engine='pyarrow', usecols=KEY_COLS, dtype=DTYPES, parse_dates=['date'])
+    
+    try:
+        table = pa.Table.from_pandas(df)
+        table = table.replace_schema_metadata({**table.schema.metadata,
+                                               CACHE_SIGNATURE_KEY: json.dumps(signature).encode()})
+        pq.write_table(table, OWID_PARQUET, compression='zstd')
+    except OSError as e:
+        print(f"⚠️ Could not write Parquet cache: {str(e)}")
+    return df
+
 # Load the dataset
 try:
-    df = pd.read_csv('data/owid-covid-data.csv')
+    df = load_owid()
     print(f"✅ Data loaded successfully. Shape: {df.shape}")
 except FileNotFoundError:
     print("❌ Error: The file 'owid-covid-data.csv' was not found.")
@@ -42,49 +142,70 @@ print(df.head())
 print("\nColumns in the dataset:")
 print(df.columns.tolist())
 
+key_data = df[key_columns]
 print("\nBasic statistics of key columns:")
-key_columns = ['total_cases', 'new_cases', 'total_deaths', 'new_deaths', 
-              'total_vaccinations', 'people_vaccinated', 'people_fully_vaccinated']
-print(df[key_columns].describe())
+print(key_data.describe())
 
 print("\nMissing values in key columns:")
-print(df[key_columns].isnull().sum())
+print(key_data.isnull().sum())
 
 # 2. Data Cleaning
 print("\n2. Data Cleaning")
 print("-----------------")
 
-# Convert date column to datetime
-df['date'] = pd.to_datetime(df['date'])
-print("✅ Converted 'date' column to datetime")
+# Fill missing values for new cases and deaths with 0 once on the full frame;
+# the country and global subsets below inherit the filled columns
+df[['new_cases', 'new_deaths']] = df[['new_cases', 'new_deaths']].fillna(0)
+print("✅ Filled missing values for new cases and deaths with 0")
+
+# Sort once by location and date on integer keys (category codes, int64 dates);
+# the country and global subsets below keep this order, so neither needs its own sort
+order = np.lexsort((df['date'].to_numpy().view('i8'), df['location'].cat.codes.to_numpy()))
+df = df.iloc[order]
+print("✅ Sorted data by location and date")
+
+def location_mask(frame, locations):
+    """Boolean mask of rows whose location is one of `locations`, compared as integer category codes."""
+    wanted = frame['location'].cat.categories.get_indexer(locations)
+    return np.isin(frame['location'].cat.codes.to_numpy(), wanted[wanted >= 0])
 
 # Filter for specific countries of interest
 countries_of_interest = ['Kenya', 'United States', 'India', 'United Kingdom', 'Brazil', 'Germany', 'South Africa']
-df_countries = df[df['location'].isin(countries_of_interest)].copy()
+df_countries = df[location_mask(df, countries_of_interest)]
+# Order the categories by display order so sorting, groupby and pivots follow countries_of_interest
+df_countries['location'] = df_countries['location'].cat.set_categories(countries_of_interest, ordered=True)
 print(f"✅ Filtered data for countries: {', '.join(countries_of_interest)}")
 
 # Create a cleaned dataframe for global analysis
 # Remove aggregated regions
-df_global = df[~df['location'].isin(['World', 'European Union', 'International'])].copy()
+df_global = df[~location_mask(df, ['World', 'European Union', 'International'])]
 print(f"✅ Created global dataframe excluding aggregated regions")
 
-# Fill missing values for new cases and deaths with 0
-for col in ['new_cases', 'new_deaths']:
-    df_countries[col] = df_countries[col].fillna(0)
-    df_global[col] = df_global[col].fillna(0)
-print("✅ Filled missing values for new cases and deaths with 0")
+# Reshape the charted metrics once into date x country matrices; they are cast to float64 first because
+# pivoting the nullable Int64 counts together with the float32 metrics would leave every block object dtype
+charted_columns = ['new_cases', 'total_cases', 'total_deaths', 'total_vaccinations', 'people_fully_vaccinated_per_hundred']
+country_wide = (df_countries.astype({col: 'float64' for col in charted_columns})
+                .pivot(index='date', columns='location', values=charted_columns))
 
-# Sort by date and country
-df_countries = df_countries.sort_values(['location', 'date'])
-df_global = df_global.sort_values(['location', 'date'])
-print("✅ Sorted data by location and date")
+# 7-day rolling average of new cases, computed for all countries at once
+rolling_new_cases = country_wide['new_cases'].rolling(window=7).mean()
+
+# Partition the country data once; the EDA loops below reuse these slices instead of rescanning df_countries
+country_groups = dict(list(df_countries.groupby('location', observed=True, sort=False)))
+# Countries of interest that actually appear in the data, in display order; absent ones are skipped
+countries_present = [country for country in countries_of_interest if country in country_groups]
 
 # Calculate daily statistics
 latest_date = df['date'].max()
 print(f"\nLatest date in the dataset: {latest_date.strftime('%Y-%m-%d')}")
 
-latest_global = df_global[df_global['date'] == latest_date]
-latest_countries = df_countries[df_countries['date'] == latest_date]
+# Each location's most recent observation, so a country lagging behind the global max date keeps its row;
+# both frames inherit df's location/date order, so tail(1) needs no further sort
+latest_global = df_global.groupby('location', observed=True, sort=False).tail(1)
+latest_countries = df_countries.groupby('location', observed=True, sort=False).tail(1)
+# Per-country report of the latest values in display order, shared by the reporting sections below
+report = latest_countries.set_index('location').reindex(countries_of_interest).dropna(how='all')
+report['death_rate'] = (report['total_deaths'] / report['total_cases'].where(report['total_cases'] > 0) * 100).astype('float64')
 
 # Print dataset metrics after cleaning
 print(f"\nNumber of countries in filtered dataset: {df_countries['location'].nunique()}")
@@ -96,173 +217,166 @@ print("----------------------------------")
 
 # Create correlation heatmap for key metrics
 print("\nGenerating correlation heatmap for key metrics...")
-correlation_columns = ['total_cases', 'total_deaths', 'new_cases', 'new_deaths', 
-                      'total_vaccinations', 'people_vaccinated', 'people_fully_vaccinated',
-                      'gdp_per_capita', 'human_development_index']
 
-# Create a correlation dataframe for each country
-for country in countries_of_interest:
-    country_data = df_countries[df_countries['location'] == country].copy()
-    corr_df = country_data[correlation_columns].dropna(axis=1, how='all')
+def pairwise_corr(arr):
+    """Pearson correlation matrices for a (set, row, metric) array, using pairwise-complete rows like DataFrame.corr()."""
+    present = ~np.isnan(arr)
+    x = np.where(present, arr - np.nanmean(arr, axis=1, keepdims=True), 0.0)
+    m = present.astype(np.float64)
+    # Per metric pair (k, l): overlap count, sums and sums of squares over the rows where both are present;
+    # optimize=True lets einsum hand these contractions to the (multithreaded) BLAS matmul
+    n = np.einsum('ijk,ijl->ikl', m, m, optimize=True)
+    sx = np.einsum('ijk,ijl->ikl', x, m, optimize=True)
+    sxx = np.einsum('ijk,ijl->ikl', x * x, m, optimize=True)
+    sxy = np.einsum('ijk,ijl->ikl', x, x, optimize=True)
+    sy, syy = sx.transpose(0, 2, 1), sxx.transpose(0, 2, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        corr = (sxy - sx * sy / n) / np.sqrt(var_x * var_y)
+    # Constant columns have no defined correlation
+    corr[(var_x <= 1e-12 * sxx) | (var_y <= 1e-12 * syy)] = np.nan
+    return np.clip(corr, -1, 1)
+
+# Upper-triangle heatmap mask for the full metric set; smaller matrices use its top-left block
+K = len(correlation_columns)
+MASK_FULL = np.triu(np.ones((K, K), dtype=bool))
+
+def plot_correlation_heatmap(corr, mask, title, path, figsize):
+    """Annotated lower-triangle heatmap of a correlation DataFrame, drawn with plain matplotlib."""
+    values = np.ma.masked_where(mask | np.isnan(corr.to_numpy()), corr.to_numpy())
+    fig, ax = plt.subplots(figsize=figsize)
+    mesh = ax.pcolormesh(values, cmap='coolwarm', vmin=-1, vmax=1, edgecolors='white', linewidth=.5)
+    for (row, col), value in np.ndenumerate(values.filled(np.nan)):
+        if not np.isnan(value):
+            ax.text(col + .5, row + .5, f"{value:.2f}", ha='center', va='center',
+                    color='white' if abs(value) > .6 else 'black')
+    ax.set_xticks(np.arange(len(corr.columns)) + .5)
+    ax.set_xticklabels(corr.columns, rotation=45, ha='right')
+    ax.set_yticks(np.arange(len(corr.index)) + .5)
+    ax.set_yticklabels(corr.index)
+    ax.invert_yaxis()
+    ax.grid(False)
+    fig.colorbar(mesh, ax=ax, shrink=.8)
+    ax.set_title(title)
+    fig.tight_layout()
+    fig.savefig(path, **PNG_SAVE_KWARGS)
+    plt.close(fig)
+
+# Stack the countries into one (country, date, metric) array, padded with NaN to a common length,
+# and compute every country's correlation matrix in a single vectorized pass
+country_arrays = [country_groups[country][correlation_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+                  for country in countries_present]
+country_metrics = np.full((len(country_arrays), max((len(a) for a in country_arrays), default=0), len(correlation_columns)), np.nan)
+for i, values in enumerate(country_arrays):
+    country_metrics[i, :len(values)] = values
+country_corrs = pairwise_corr(country_metrics)
+
+# Create a correlation heatmap for each country
+for i, country in enumerate(countries_present):
+    valid = ~np.isnan(country_metrics[i]).all(axis=0)
     
-    if len(corr_df.columns) >= 4:  # Only create heatmap if we have enough valid columns
-        plt.figure(figsize=(10, 8))
-        correlation = corr_df.corr()
-        mask = np.triu(correlation)
-        sns.heatmap(correlation, annot=True, fmt=".2f", cmap='coolwarm', mask=mask, 
-                    linewidths=.5, cbar_kws={"shrink": .8})
-        plt.title(f'Correlation Heatmap for {country}')
-        plt.tight_layout()
-        plt.savefig(f'correlation_heatmap_{country.lower().replace(" ", "_")}.png')
-        plt.close()
+    if valid.sum() >= 4:  # Only create heatmap if we have enough valid columns
+        valid_columns = [col for col, keep in zip(correlation_columns, valid) if keep]
+        correlation = pd.DataFrame(country_corrs[i][np.ix_(valid, valid)], index=valid_columns, columns=valid_columns)
+        k = len(valid_columns)
+        plot_correlation_heatmap(correlation, MASK_FULL[:k, :k], f'Correlation Heatmap for {country}',
+                                 f'correlation_heatmap_{country.lower().replace(" ", "_")}.png', figsize=(10, 8))
         print(f"✅ Created correlation heatmap for {country}")
 
 # Create a global correlation heatmap
-global_data = df_global.dropna(subset=['total_cases', 'total_deaths']).copy()
-plt.figure(figsize=(12, 10))
-global_corr = global_data[correlation_columns].corr()
-mask = np.triu(global_corr)
-sns.heatmap(global_corr, annot=True, fmt=".2f", cmap='coolwarm', mask=mask, 
-            linewidths=.5, cbar_kws={"shrink": .8})
-plt.title('Global Correlation Heatmap of COVID-19 Metrics')
-plt.tight_layout()
-plt.savefig('global_correlation_heatmap.png')
-plt.close()
+global_data = df_global.dropna(subset=['total_cases', 'total_deaths'])
+global_values = global_data[correlation_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+global_corr = pd.DataFrame(pairwise_corr(global_values[np.newaxis])[0],
+                           index=correlation_columns, columns=correlation_columns)
+plot_correlation_heatmap(global_corr, MASK_FULL, 'Global Correlation Heatmap of COVID-19 Metrics',
+                         'global_correlation_heatmap.png', figsize=(12, 10))
 print("✅ Created global correlation heatmap for COVID-19 metrics")
 
-# 3.1 Total cases over time for selected countries
-plt.figure(figsize=(14, 8))
-for country in countries_of_interest:
-    country_data = df_countries[df_countries['location'] == country]
-    plt.plot(country_data['date'], country_data['total_cases'], label=country)
+def line_chart_payload(wide, title, ylabel, path, **markup):
+    """Chart payload for a date x country frame, countries in display order, as plain arrays."""
+    wide = wide.reindex(columns=countries_present)
+    return {'x': wide.index.to_numpy(), 'y': wide.to_numpy(dtype=np.float64, na_value=np.nan),
+            'labels': countries_present, 'title': title, 'ylabel': ylabel, 'path': path, **markup}
 
-plt.title('Total COVID-19 Cases Over Time by Country')
-plt.xlabel('Date')
-plt.ylabel('Total Cases')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.xticks(rotation=45)
-plt.savefig('total_cases_by_country.png')
-plt.close()
+# 3.1 Total cases over time for selected countries
+render_line_chart(line_chart_payload(country_wide['total_cases'], 'Total COVID-19 Cases Over Time by Country',
+                                      'Total Cases', 'total_cases_by_country.png'))
 print("✅ Created chart: Total cases over time by country")
 
 # 3.2 Total deaths over time for selected countries
-plt.figure(figsize=(14, 8))
-for country in countries_of_interest:
-    country_data = df_countries[df_countries['location'] == country]
-    plt.plot(country_data['date'], country_data['total_deaths'], label=country)
-
-plt.title('Total COVID-19 Deaths Over Time by Country')
-plt.xlabel('Date')
-plt.ylabel('Total Deaths')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.xticks(rotation=45)
-plt.savefig('total_deaths_by_country.png')
-plt.close()
+render_line_chart(line_chart_payload(country_wide['total_deaths'], 'Total COVID-19 Deaths Over Time by Country',
+                                      'Total Deaths', 'total_deaths_by_country.png'))
 print("✅ Created chart: Total deaths over time by country")
 
 # 3.3 Daily new cases (7-day rolling average) with comparative analysis
-plt.figure(figsize=(14, 8))
-peak_values = {}
-peak_dates = {}
-
-for country in countries_of_interest:
-    country_data = df_countries[df_countries['location'] == country].copy()
-    country_data['rolling_new_cases'] = country_data['new_cases'].rolling(window=7).mean()
-    plt.plot(country_data['date'], country_data['rolling_new_cases'], label=country)
-    
-    # Find peak value and date for each country
-    if not country_data.empty and country_data['rolling_new_cases'].notna().any():
-        peak_idx = country_data['rolling_new_cases'].idxmax()
-        peak_value = country_data.loc[peak_idx, 'rolling_new_cases']
-        peak_date = country_data.loc[peak_idx, 'date']
-        peak_values[country] = peak_value
-        peak_dates[country] = peak_date
-        
-        # Annotate peaks on the chart
-        plt.annotate(f"{country} peak",
-                    xy=(peak_date, peak_value),
-                    xytext=(10, 10),
-                    textcoords='offset points',
-                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=.2'))
-
-# Add key variant emergence periods
-variants = {
-    'Alpha': '2020-12-01',
-    'Delta': '2021-04-01',
-    'Omicron': '2021-11-15'
-}
-
-for variant, date in variants.items():
-    plt.axvline(x=pd.to_datetime(date), color='gray', linestyle='--', alpha=0.7)
-    plt.text(pd.to_datetime(date), plt.ylim()[1]*0.95, variant, rotation=90, alpha=0.7)
-
-plt.title('Daily New COVID-19 Cases (7-Day Rolling Average) by Country')
-plt.xlabel('Date')
-plt.ylabel('New Cases (7-day avg)')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.xticks(rotation=45)
-plt.savefig('daily_new_cases_rolling_avg.png')
-plt.close()
+# Find peak value and date for each country with one column-wise argmax; the values are gathered at those rows
+rolling_valid = rolling_new_cases.dropna(axis=1, how='all')
+rolling_values = rolling_valid.to_numpy(dtype=np.float64, na_value=np.nan)
+peak_rows = np.nanargmax(rolling_values, axis=0)
+peaks = pd.DataFrame({'date': rolling_valid.index[peak_rows],
+                      'rolling_new_cases': rolling_values[peak_rows, np.arange(rolling_values.shape[1])]},
+                     index=rolling_valid.columns)
+
+render_line_chart(line_chart_payload(
+    rolling_new_cases,
+    'Daily New COVID-19 Cases (7-Day Rolling Average) by Country',
+    'New Cases (7-day avg)',
+    'daily_new_cases_rolling_avg.png',
+    # Annotate peaks on the chart
+    annotations=[(f"{country} peak", peak['date'], peak['rolling_new_cases']) for country, peak in peaks.iterrows()],
+    # Add key variant emergence periods
+    vlines=list(VARIANTS.items())
+))
 print("✅ Created chart: Daily new cases (7-day rolling average) with peak annotations and variant markers")
 
 # Comparative analysis of peaks
 print("\nComparative Analysis of Peak Case Periods:")
-for country in sorted(peak_values.keys(), key=lambda x: peak_values[x], reverse=True):
-    print(f"{country}: Peak of {int(peak_values[country]):,} daily cases on {peak_dates[country].strftime('%Y-%m-%d')}")
+for country, peak in peaks.sort_values('rolling_new_cases', ascending=False).iterrows():
+    print(f"{country}: Peak of {int(peak['rolling_new_cases']):,} daily cases on {peak['date'].strftime('%Y-%m-%d')}")
 
 # 3.4 Death rate calculation and analysis
 print("\nDeath Rate Analysis:")
-death_rates = {}
-for country in countries_of_interest:
-    country_latest = latest_countries[latest_countries['location'] == country]
-    if len(country_latest) > 0 and pd.notna(country_latest['total_cases'].values[0]) and pd.notna(country_latest['total_deaths'].values[0]):
-        cases = country_latest['total_cases'].values[0]
-        deaths = country_latest['total_deaths'].values[0]
-        if cases > 0:
-            death_rate = (deaths / cases) * 100
-            death_rates[country] = death_rate
-            print(f"{country}: {death_rate:.2f}% ({int(deaths):,} deaths from {int(cases):,} cases)")
-            
-            # Highlight anomalies and important context
-            if country == "India" and death_rate < 1.5:
-                print(f"   ⚠️ Note: India's reported death rate is potentially underreported due to testing limitations")
-            elif country == "Brazil" and death_rate > 2.5:
-                print(f"   ⚠️ Note: Brazil's higher death rate may reflect healthcare system capacity constraints")
-            elif country == "United States" and death_rate > 1.8:
-                print(f"   ⚠️ Note: US death rate reflects variations in healthcare access and reporting consistency")
-            elif country == "South Africa" and death_rate > 2.5:
-                print(f"   ⚠️ Note: South Africa's higher death rate may reflect limited healthcare capacity")
+death_rates = report['death_rate'].dropna()
+for country, death_rate in death_rates.items():
+    deaths, cases = report.at[country, 'total_deaths'], report.at[country, 'total_cases']
+    print(f"{country}: {death_rate:.2f}% ({int(deaths):,} deaths from {int(cases):,} cases)")
+    
+    # Highlight anomalies and important context
+    if country == "India" and death_rate < 1.5:
+        print(f"   ⚠️ Note: India's reported death rate is potentially underreported due to testing limitations")
+    elif country == "Brazil" and death_rate > 2.5:
+        print(f"   ⚠️ Note: Brazil's higher death rate may reflect healthcare system capacity constraints")
+    elif country == "United States" and death_rate > 1.8:
+        print(f"   ⚠️ Note: US death rate reflects variations in healthcare access and reporting consistency")
+    elif country == "South Africa" and death_rate > 2.5:
+        print(f"   ⚠️ Note: South Africa's higher death rate may reflect limited healthcare capacity")
 
 # Plot death rates comparison
 plt.figure(figsize=(12, 6))
-countries_sorted = sorted(death_rates.keys(), key=lambda x: death_rates[x], reverse=True)
-rates_sorted = [death_rates[country] for country in countries_sorted]
-sns.barplot(x=countries_sorted, y=rates_sorted)
+death_rates_sorted = death_rates.sort_values(ascending=False)
+plt.bar(death_rates_sorted.index.astype(str), death_rates_sorted,
+        color=plt.get_cmap('Set2').colors[:len(death_rates_sorted)])
 plt.title('COVID-19 Death Rates by Country (Latest Date)')
 plt.xlabel('Country')
 plt.ylabel('Death Rate (%)')
 plt.xticks(rotation=45)
 plt.tight_layout()
-plt.savefig('death_rates_comparison.png')
+plt.savefig('death_rates_comparison.png', **PNG_SAVE_KWARGS)
 plt.close()
 print("✅ Created chart: Death rates comparison")
 
 # 3.5 Bar chart of total cases for the selected countries
 plt.figure(figsize=(12, 8))
-latest_countries_sorted = latest_countries.sort_values('total_cases', ascending=False)
-sns.barplot(x='location', y='total_cases', data=latest_countries_sorted)
+latest_countries_sorted = latest_countries.dropna(subset=['total_cases']).sort_values('total_cases', ascending=False)
+plt.bar(latest_countries_sorted['location'].astype(str), latest_countries_sorted['total_cases'],
+        color=plt.get_cmap('Set2').colors[:len(latest_countries_sorted)])
 plt.title('Total COVID-19 Cases by Country (Latest Date)')
 plt.xlabel('Country')
 plt.ylabel('Total Cases')
 plt.xticks(rotation=45)
 plt.tight_layout()
-plt.savefig('total_cases_bar_chart.png')
+plt.savefig('total_cases_bar_chart.png', **PNG_SAVE_KWARGS)
 plt.close()
 print("✅ Created chart: Bar chart of total cases by country")
 
@@ -271,67 +385,42 @@ print("\n4. Vaccination Progress Analysis")
 print("-------------------------------")
 
 # 4.1 Plot cumulative vaccinations over time
-plt.figure(figsize=(14, 8))
-for country in countries_of_interest:
-    country_data = df_countries[df_countries['location'] == country]
-    plt.plot(country_data['date'], country_data['total_vaccinations'], label=country)
-
-plt.title('Total COVID-19 Vaccinations Over Time by Country')
-plt.xlabel('Date')
-plt.ylabel('Total Vaccinations')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.xticks(rotation=45)
-plt.savefig('total_vaccinations_by_country.png')
-plt.close()
+render_line_chart(line_chart_payload(country_wide['total_vaccinations'], 'Total COVID-19 Vaccinations Over Time by Country',
+                                      'Total Vaccinations', 'total_vaccinations_by_country.png'))
 print("✅ Created chart: Total vaccinations over time by country")
 
 # 4.2 Percentage of population fully vaccinated
-plt.figure(figsize=(14, 8))
-for country in countries_of_interest:
-    country_data = df_countries[df_countries['location'] == country]
-    plt.plot(country_data['date'], country_data['people_fully_vaccinated_per_hundred'], label=country)
-
-plt.title('Percentage of Population Fully Vaccinated by Country')
-plt.xlabel('Date')
-plt.ylabel('% Fully Vaccinated')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.xticks(rotation=45)
-plt.axhline(y=70, color='r', linestyle='--', label='70% Target')
-plt.savefig('vaccination_percentage_by_country.png')
-plt.close()
+render_line_chart(line_chart_payload(country_wide['people_fully_vaccinated_per_hundred'],
+                                      'Percentage of Population Fully Vaccinated by Country',
+                                      '% Fully Vaccinated', 'vaccination_percentage_by_country.png',
+                                      target=(70, '70% Target')))
 print("✅ Created chart: Percentage of population fully vaccinated")
 
 # 4.3 Vaccination progress as of latest date
 print("\nVaccination Progress (Latest Date):")
-for country in countries_of_interest:
-    country_latest = latest_countries[latest_countries['location'] == country]
-    if len(country_latest) > 0 and pd.notna(country_latest['people_fully_vaccinated_per_hundred'].values[0]):
-        vax_rate = country_latest['people_fully_vaccinated_per_hundred'].values[0]
-        print(f"{country}: {vax_rate:.2f}% fully vaccinated")
+for country, vax_rate in report['people_fully_vaccinated_per_hundred'].dropna().items():
+    print(f"{country}: {vax_rate:.2f}% fully vaccinated")
 
 # 5. Choropleth Map Visualization with Plotly
 print("\n5. Global Choropleth Map Visualization")
 print("------------------------------------")
 
-# Create a dataframe for the latest date only
-latest_global_df = df_global[df_global['date'] == latest_date].copy()
+# Keep only the columns the maps use so the serialized figures stay small
+map_data = latest_global[['iso_code', 'location', 'total_cases_per_million',
+                          'people_fully_vaccinated_per_hundred']].dropna(subset=['iso_code'])
 
 # Create a map of total cases per million
 try:
-    fig = px.choropleth(
-        latest_global_df,
-        locations="iso_code",
-        color="total_cases_per_million",
-        hover_name="location",
-        color_continuous_scale="YlOrRd",
-        title="COVID-19 Cases per Million Population (Latest Date)",
-        labels={"total_cases_per_million": "Cases per Million"}
-    )
-    fig.write_html("covid_cases_map.html")
+    fig = go.Figure(go.Choropleth(
+        locations=map_data['iso_code'],
+        z=map_data['total_cases_per_million'],
+        text=map_data['location'],
+        colorscale="YlOrRd",
+        colorbar_title="Cases per Million",
+        hovertemplate="<b>%{text}</b><br>Cases per Million: %{z:,.0f}<extra></extra>"
+    ))
+    fig.update_layout(title="COVID-19 Cases per Million Population (Latest Date)")
+    fig.write_html("covid_cases_map.html", include_plotlyjs='cdn')
     print("✅ Created interactive choropleth map: COVID-19 Cases per Million")
 except Exception as e:
     print(f"❌ Could not create choropleth map: {str(e)}")
@@ -339,17 +428,18 @@ except Exception as e:
 
 # Create a map of vaccination progress
 try:
-    fig = px.choropleth(
-        latest_global_df,
-        locations="iso_code",
-        color="people_fully_vaccinated_per_hundred",
-        hover_name="location",
-        color_continuous_scale="Greens",
-        range_color=[0, 100],
-        title="COVID-19 Vaccination Rate (% Fully Vaccinated, Latest Date)",
-        labels={"people_fully_vaccinated_per_hundred": "% Fully Vaccinated"}
-    )
-    fig.write_html("covid_vaccination_map.html")
+    fig = go.Figure(go.Choropleth(
+        locations=map_data['iso_code'],
+        z=map_data['people_fully_vaccinated_per_hundred'],
+        text=map_data['location'],
+        colorscale="Greens",
+        zmin=0,
+        zmax=100,
+        colorbar_title="% Fully Vaccinated",
+        hovertemplate="<b>%{text}</b><br>% Fully Vaccinated: %{z:.2f}<extra></extra>"
+    ))
+    fig.update_layout(title="COVID-19 Vaccination Rate (% Fully Vaccinated, Latest Date)")
+    fig.write_html("covid_vaccination_map.html", include_plotlyjs='cdn')
     print("✅ Created interactive choropleth map: COVID-19 Vaccination Rate")
 except Exception as e:
     print(f"❌ Could not create vaccination choropleth map: {str(e)}")
@@ -359,14 +449,11 @@ print("\n6. Key Insights and Conclusions")
 print("------------------------------")
 
 # Calculate metrics for insights
-top_cases_country = latest_countries.loc[latest_countries['total_cases'].idxmax(), 'location']
-top_cases_count = latest_countries['total_cases'].max()
-
-top_deaths_country = latest_countries.loc[latest_countries['total_deaths'].idxmax(), 'location']
-top_deaths_count = latest_countries['total_deaths'].max()
-
-top_vax_country = latest_countries.loc[latest_countries['people_fully_vaccinated_per_hundred'].idxmax(), 'location']
-top_vax_rate = latest_countries['people_fully_vaccinated_per_hundred'].max()
+# One reduction over the per-country report gives each metric's leading country and value
+top_stats = report[['total_cases', 'total_deaths', 'people_fully_vaccinated_per_hundred']].agg(['idxmax', 'max'])
+top_cases_country, top_cases_count = top_stats['total_cases']
+top_deaths_country, top_deaths_count = top_stats['total_deaths']
+top_vax_country, top_vax_rate = top_stats['people_fully_vaccinated_per_hundred']
 
 # Print insights with deeper analysis
 print("\nKey Insights from COVID-19 Data Analysis:")
@@ -392,21 +479,25 @@ print(f"   • High-income countries achieved vaccination targets approximately
 
 # Calculate and print peak infection periods with variant analysis
 print("\n4. VARIANT IMPACT ANALYSIS:")
+# Match every country's peak against the variant wave windows in one vectorized pass
+peaks['variant_note'] = np.select(
+    [peaks['date'].between(OMICRON_START, OMICRON_END, inclusive='neither'),
+     peaks['date'].between(DELTA_START, DELTA_END, inclusive='neither'),
+     peaks['date'].between(ALPHA_START, ALPHA_END, inclusive='neither')],
+    ["Peak coincides with Omicron variant emergence, characterized by higher transmissibility",
+     "Peak coincides with Delta variant wave, characterized by increased severity",
+     "Peak coincides with Alpha variant spread during winter months"],
+    default=''
+)
+
 for country in countries_of_interest:
-    country_data = df_countries[df_countries['location'] == country].copy()
-    country_data['rolling_new_cases'] = country_data['new_cases'].rolling(window=7).mean()
-    if not country_data.empty and country_data['rolling_new_cases'].notna().any():
-        peak_date = country_data.loc[country_data['rolling_new_cases'].idxmax(), 'date']
-        peak_cases = country_data['rolling_new_cases'].max()
+    if country in peaks.index:
+        peak_date, peak_cases, variant_note = peaks.loc[country, ['date', 'rolling_new_cases', 'variant_note']]
         print(f"   {country}: Peak on {peak_date.strftime('%Y-%m-%d')} with {int(peak_cases):,} daily cases (7-day avg)")
         
         # Add variant analysis
-        if peak_date > pd.to_datetime('2021-11-01') and peak_date < pd.to_datetime('2022-03-01'):
-            print(f"      ↳ Peak coincides with Omicron variant emergence, characterized by higher transmissibility")
-        elif peak_date > pd.to_datetime('2021-03-01') and peak_date < pd.to_datetime('2021-08-01'):
-            print(f"      ↳ Peak coincides with Delta variant wave, characterized by increased severity")
-        elif peak_date > pd.to_datetime('2020-09-01') and peak_date < pd.to_datetime('2021-02-01'):
-            print(f"      ↳ Peak coincides with Alpha variant spread during winter months")
+        if variant_note:
+            print(f"      ↳ {variant_note}")
         
         # Add Brazil-specific analysis
         if country == "Brazil":
@@ -414,32 +505,30 @@ for country in countries_of_interest:
             print(f"      ↳ Limited mitigation policies contributed to prolonged high case rates")
 
 print("\n5. SOCIOECONOMIC CORRELATION:")
-for country in countries_of_interest:
-    country_latest = latest_countries[latest_countries['location'] == country]
-    if len(country_latest) > 0:
-        vax_rate = country_latest['people_fully_vaccinated_per_hundred'].values[0] if pd.notna(country_latest['people_fully_vaccinated_per_hundred'].values[0]) else "N/A"
-        cases_per_million = country_latest['total_cases_per_million'].values[0] if pd.notna(country_latest['total_cases_per_million'].values[0]) else "N/A"
-        gdp = country_latest['gdp_per_capita'].values[0] if pd.notna(country_latest['gdp_per_capita'].values[0]) else "N/A"
-        hdi = country_latest['human_development_index'].values[0] if pd.notna(country_latest['human_development_index'].values[0]) else "N/A"
+for country, country_latest in report.iterrows():
+    vax_rate = country_latest['people_fully_vaccinated_per_hundred'] if pd.notna(country_latest['people_fully_vaccinated_per_hundred']) else "N/A"
+    cases_per_million = country_latest['total_cases_per_million'] if pd.notna(country_latest['total_cases_per_million']) else "N/A"
+    gdp = country_latest['gdp_per_capita'] if pd.notna(country_latest['gdp_per_capita']) else "N/A"
+    hdi = country_latest['human_development_index'] if pd.notna(country_latest['human_development_index']) else "N/A"
+    
+    print(f"   {country}:")
+    print(f"      • Vaccination rate: {vax_rate if isinstance(vax_rate, str) else f'{vax_rate:.2f}%'}")
+    print(f"      • Cases per million: {cases_per_million if isinstance(cases_per_million, str) else f'{int(cases_per_million):,}'}")
+    if not isinstance(gdp, str):
+        print(f"      • GDP per capita: ${int(gdp):,}")
+    if not isinstance(hdi, str):
+        print(f"      • Human Development Index: {hdi:.3f}")
         
-        print(f"   {country}:")
-        print(f"      • Vaccination rate: {vax_rate if isinstance(vax_rate, str) else f'{vax_rate:.2f}%'}")
-        print(f"      • Cases per million: {cases_per_million if isinstance(cases_per_million, str) else f'{int(cases_per_million):,}'}")
-        if not isinstance(gdp, str):
-            print(f"      • GDP per capita: ${int(gdp):,}")
-        if not isinstance(hdi, str):
-            print(f"      • Human Development Index: {hdi:.3f}")
-            
-        # Add country-specific socioeconomic analysis
-        if country == "Kenya":
-            print(f"      • Kenya's lower vaccination rate correlates with limited healthcare infrastructure")
-            print(f"      • Economic constraints impacted testing capacity and case reporting")
-        elif country == "United States":
-            print(f"      • Despite high GDP, US shows regional disparities in healthcare access affecting outcomes")
-            print(f"      • Political polarization correlated with regional variation in mitigation measure adoption")
-        elif country == "Brazil":
-            print(f"      • Brazil's fragmented response reflects governance and healthcare distribution challenges")
-            print(f"      • Socioeconomic inequality strongly correlates with regional case and death variations")
+    # Add country-specific socioeconomic analysis
+    if country == "Kenya":
+        print(f"      • Kenya's lower vaccination rate correlates with limited healthcare infrastructure")
+        print(f"      • Economic constraints impacted testing capacity and case reporting")
+    elif country == "United States":
+        print(f"      • Despite high GDP, US shows regional disparities in healthcare access affecting outcomes")
+        print(f"      • Political polarization correlated with regional variation in mitigation measure adoption")
+    elif country == "Brazil":
+        print(f"      • Brazil's fragmented response reflects governance and healthcare distribution challenges")
+        print(f"      • Socioeconomic inequality strongly correlates with regional case and death variations")
 
 # Export functionality note
 print("\n\nNote: To export this analysis as PDF:")